@@ -645,7 +645,9 @@ def get_distribution_data(data_type="countries", filters=None):
     except Exception as e:
         return pd.DataFrame(), f"❌ Error getting {data_type} data: {str(e)}"
 
-@st.cache_data(ttl=300)
+# Cached as a resource so reruns get the same DataFrame by reference instead of an unpickled copy;
+# callers only read it (chart + year selector), never mutate it
+@st.cache_resource(ttl=300)
 def get_release_years_data():
     """Get count of unique songs by release year from songs_master collection."""
     client, status = get_mongo_client()
@@ -670,26 +672,29 @@ def get_release_years_data():
                 "_id": "$release_date_year",
                 "song_count": {"$sum": 1}
             }},
+            # Fill in the years between the first and last release year that have no songs
+            {"$densify": {
+                "field": "_id",
+                "range": {"step": 1, "bounds": "full"}
+            }},
             {"$project": {
                 "_id": 0,
                 "year": "$_id",
-                "count": "$song_count"
+                "count": {"$ifNull": ["$song_count", 0]}
             }},
             {"$sort": {"year": 1}}
         ]
         
         results = list(songs_collection.aggregate(pipeline, allowDiskUse=True))
-        df = pd.DataFrame(results)
         
-        if not df.empty:
-            min_year = int(df['year'].min())
-            max_year = int(df['year'].max())
-            
-            all_years = pd.DataFrame({'year': range(min_year, max_year + 1)})
-            df = all_years.merge(df, on='year', how='left')
-            df['count'] = df['count'].fillna(0)
-            df['year'] = df['year'].astype(int)
-            df['count'] = df['count'].astype(int)
+        if not results:
+            return pd.DataFrame(), status
+        
+        # Build the two typed columns directly rather than a frame of row dicts
+        df = pd.DataFrame({
+            'year': pd.Series([doc["year"] for doc in results], dtype='int64'),
+            'count': pd.Series([doc["count"] for doc in results], dtype='int64')
+        })
         
         return df, status
         
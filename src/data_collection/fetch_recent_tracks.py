@@ -15,6 +15,7 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 import requests
 from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -232,6 +233,10 @@ class MongoDBManager:
                 logger.info("No documents found in database")
                 return None
                 
+        except ConnectionFailure:
+            # An unreachable database is not an empty one - returning None here would re-insert every track
+            logger.error("Lost connection to MongoDB while reading the latest timestamp")
+            raise
         except Exception as e:
             logger.error(f"Error getting latest timestamp: {e}")
             return None
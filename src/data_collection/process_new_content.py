@@ -12,15 +12,19 @@ Collections:
 """
 
 import os
-import json
 import time
 import base64
-import re
 import logging
-from typing import List, Dict, Set, Tuple, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Set, Tuple, Any, Optional, Callable
 from datetime import datetime
+import msgspec
 import requests
-from pymongo import MongoClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -38,15 +42,146 @@ MONGODB_CONNECTION_STRING = os.getenv('MONGODB_CONNECTION_STRING')
 # Spotify API Configuration
 SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET')
-REQUEST_DELAY = 0.2
 BATCH_SIZE = 50
+MAX_CONCURRENT_REQUESTS = 2  # Batches fetched in parallel
+REQUESTS_PER_SECOND = 10     # Token-bucket refill rate shared by all API calls
+TOKEN_CACHE_FILE = os.getenv('SPOTIFY_TOKEN_CACHE', os.path.expanduser('~/.cache/spotify_dashboard/token.json'))
+TOKEN_EXPIRY_MARGIN = 60     # Seconds before expiry at which a cached token is treated as stale
+MAX_RETRIES = 5              # Retries on HTTP 429/5xx before giving up
+
+# Spotify API Endpoints (batch endpoints take a comma-separated id list appended to the URL)
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+SPOTIFY_TRACKS_URL = "https://api.spotify.com/v1/tracks?ids="
+SPOTIFY_ARTISTS_URL = "https://api.spotify.com/v1/artists?ids="
+TRACK_URI_PREFIX = "spotify:track:"
 
 logger = logging.getLogger(__name__)
 
+# Spotify response schemas - only the fields we read are decoded, the rest of the payload is skipped
+class TrackAlbum(msgspec.Struct):
+    name: Optional[str] = None
+    release_date: Optional[str] = None
+
+class TrackArtist(msgspec.Struct):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    uri: Optional[str] = None
+
+class Track(msgspec.Struct):
+    duration_ms: Optional[int] = None
+    popularity: Optional[int] = None
+    album: Optional[TrackAlbum] = None
+    artists: List[TrackArtist] = []
+
+class TracksResponse(msgspec.Struct):
+    tracks: List[Optional[Track]] = []
+
+class ArtistFollowers(msgspec.Struct):
+    total: Optional[int] = None
+
+class Artist(msgspec.Struct):
+    name: Optional[str] = None
+    uri: Optional[str] = None
+    genres: List[str] = []
+    followers: Optional[ArtistFollowers] = None
+    popularity: Optional[int] = None
+
+class ArtistsResponse(msgspec.Struct):
+    artists: List[Optional[Artist]] = []
+
+TRACKS_DECODER = msgspec.json.Decoder(TracksResponse)
+ARTISTS_DECODER = msgspec.json.Decoder(ArtistsResponse)
+
+def normalize_name(name: Optional[str]) -> str:
+    """Normalize a song/artist name for duplicate detection"""
+    return (name or "").lower().strip()
+
+def make_song_key(song_name: Optional[str], artist_name: Optional[str]) -> str:
+    """Build the normalized song key stored as norm_song_key in songs_master"""
+    return f"{normalize_name(song_name)}|{normalize_name(artist_name)}"
+
+class RateLimiter:
+    """Thread-safe token bucket that spaces requests to a steady rate"""
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        # Sleep outside the lock; the token is already reserved
+        if wait:
+            time.sleep(wait)
+
 class SpotifyAPI:
     def __init__(self):
         self.token = None
-        self.get_token()
+        self.token_lock = threading.Lock()  # Serializes token refreshes across fetch threads
+        self.session = self.create_session()
+        self.rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+        self._track_cache = {}  # Successful track lookups, keyed by track URI
+        if not self.load_cached_token():
+            self.get_token()
+    
+    @staticmethod
+    def create_session() -> requests.Session:
+        """Create a keep-alive session that retries rate-limited and failed requests"""
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
+    
+    def load_cached_token(self) -> bool:
+        """Reuse a still-valid token saved by a previous run, skipping the auth round-trip"""
+        try:
+            with open(TOKEN_CACHE_FILE, 'rb') as f:
+                cached = msgspec.json.decode(f.read())
+        except (OSError, msgspec.DecodeError):
+            return False
+        
+        # A corrupt or foreign cache file just means fetching a fresh token
+        if not isinstance(cached, dict) or not cached.get("access_token"):
+            return False
+        if cached.get("client_id") != SPOTIFY_CLIENT_ID or time.time() >= cached.get("expires_at", 0):
+            return False
+        
+        self.token = cached["access_token"]
+        self.session.headers["Authorization"] = "Bearer " + self.token
+        logger.info("✅ Reusing cached Spotify API token")
+        return True
+    
+    def save_token(self, expires_in: int):
+        """Persist the current token with its expiry so later runs can reuse it"""
+        cached = {
+            "client_id": SPOTIFY_CLIENT_ID,
+            "access_token": self.token,
+            "expires_at": time.time() + expires_in - TOKEN_EXPIRY_MARGIN
+        }
+        # Owner-only temp file, then an atomic rename so readers never see a partial token
+        temp_file = f"{TOKEN_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(TOKEN_CACHE_FILE), exist_ok=True)
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(msgspec.json.encode(cached))
+            os.replace(temp_file, TOKEN_CACHE_FILE)
+        except OSError as e:
+            logger.warning(f"Could not cache Spotify token: {e}")
     
     def get_token(self):
         """Get Spotify API access token"""
@@ -58,7 +193,6 @@ class SpotifyAPI:
         auth_bytes = auth_string.encode('utf-8')
         auth_base64 = str(base64.b64encode(auth_bytes), 'utf-8')
 
-        url = "https://accounts.spotify.com/api/token"
         headers = {
             "Authorization": "Basic " + auth_base64,
             "Content-Type": "application/x-www-form-urlencoded"
@@ -66,18 +200,59 @@ class SpotifyAPI:
         data = {"grant_type": "client_credentials"}
         
         try:
-            result = requests.post(url, headers=headers, data=data)
+            result = self.session.post(SPOTIFY_TOKEN_URL, headers=headers, data=data)
             result.raise_for_status()
-            json_result = json.loads(result.content)
+            json_result = msgspec.json.decode(result.content)
             self.token = json_result["access_token"]
+            self.session.headers["Authorization"] = "Bearer " + self.token
+            self.save_token(json_result.get("expires_in", 3600))
             logger.info("✅ Successfully obtained Spotify API token")
         except Exception as e:
             logger.error(f"Error getting Spotify token: {e}")
             raise
 
-    def get_auth_header(self):
-        """Get authorization header for API requests"""
-        return {"Authorization": "Bearer " + self.token}
+    def _get(self, url: str) -> bytes:
+        """GET a Spotify API URL on the shared session (429s are retried per Retry-After)"""
+        self.rate_limiter.acquire()
+        token = self.token
+        result = self.session.get(url)
+        if result.status_code == 401:
+            # Cached token was revoked or expired early - fetch a fresh one and retry once
+            with self.token_lock:
+                # Another fetch thread may have already rotated the token
+                if self.token == token:
+                    logger.warning("Spotify token rejected, re-authenticating")
+                    self.get_token()
+            self.rate_limiter.acquire()
+            result = self.session.get(url)
+        result.raise_for_status()
+        return result.content
+
+    def _fetch_in_batches(self, fetch_batch: Callable[[List[str]], Dict[str, Dict]], ids: List[str]) -> Dict[str, Dict]:
+        """Split ids into API-sized batches and fetch them concurrently"""
+        batches = [ids[i:i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            for batch_results in executor.map(fetch_batch, batches):
+                results.update(batch_results)
+        return results
+
+    def get_track_details(self, track_ids: List[str]) -> Dict[str, Dict]:
+        """Get track details for any number of tracks, reusing tracks already fetched this run"""
+        missing = [tid for tid in dict.fromkeys(track_ids) if tid not in self._track_cache]
+        fetched = self._fetch_in_batches(self.get_batch_track_details, missing) if missing else {}
+        
+        # Only cache successes so failed lookups are retried by the next caller
+        for track_id, track_result in fetched.items():
+            if track_result['status'] == 'success':
+                self._track_cache[track_id] = track_result
+        
+        return {tid: self._track_cache.get(tid) or fetched[tid] for tid in track_ids}
+
+    def get_artist_details(self, artist_ids: List[str]) -> Dict[str, Dict]:
+        """Get artist details for any number of artists"""
+        return self._fetch_in_batches(self.get_batch_artist_details, artist_ids)
 
     def get_batch_track_details(self, track_ids: List[str]) -> Dict[str, Dict]:
         """Get track details for up to 50 tracks in a single API call"""
@@ -85,21 +260,15 @@ class SpotifyAPI:
             raise ValueError(f"Cannot process more than {BATCH_SIZE} tracks in a single batch")
         
         # Remove spotify:track: prefix if present
-        clean_track_ids = [tid.replace('spotify:track:', '') for tid in track_ids]
-        
-        ids_string = ",".join(clean_track_ids)
-        url = f"https://api.spotify.com/v1/tracks?ids={ids_string}"
-        headers = self.get_auth_header()
+        prefix_len = len(TRACK_URI_PREFIX)
+        clean_track_ids = [tid[prefix_len:] if tid.startswith(TRACK_URI_PREFIX) else tid for tid in track_ids]
         
         try:
-            result = requests.get(url, headers=headers)
-            result.raise_for_status()
-            json_result = json.loads(result.content)
+            response = TRACKS_DECODER.decode(self._get(SPOTIFY_TRACKS_URL + ",".join(clean_track_ids)))
             
             batch_results = {}
-            tracks = json_result.get("tracks", [])
             
-            for i, track in enumerate(tracks):
+            for i, track in enumerate(response.tracks):
                 original_track_id = track_ids[i]  # Use original ID as key
                 if track is None:
                     batch_results[original_track_id] = {
@@ -114,23 +283,23 @@ class SpotifyAPI:
                         "error_message": "Track not found or not available"
                     }
                 else:
-                    duration_ms = track.get("duration_ms")
+                    duration_ms = track.duration_ms
                     duration_s = round(duration_ms / 1000, 2) if duration_ms else None
                     
-                    album = track.get("album", {})
-                    release_date = album.get("release_date")
-                    album_name = album.get("name")
+                    album = track.album or TrackAlbum()
+                    release_date = album.release_date
+                    album_name = album.name
                     release_date_year = self.extract_year_from_release_date(release_date) if release_date else None
                     
-                    popularity = track.get("popularity")
+                    popularity = track.popularity
                     
                     # Extract all artists from the track
                     artists = []
-                    for artist in track.get("artists", []):
+                    for artist in track.artists:
                         artists.append({
-                            "id": artist["id"],
-                            "name": artist["name"],
-                            "uri": artist["uri"]
+                            "id": artist.id,
+                            "name": artist.name,
+                            "uri": artist.uri
                         })
                     
                     batch_results[original_track_id] = {
@@ -169,19 +338,12 @@ class SpotifyAPI:
         if len(artist_ids) > BATCH_SIZE:
             raise ValueError(f"Cannot process more than {BATCH_SIZE} artists in a single batch")
         
-        ids_string = ",".join(artist_ids)
-        url = f"https://api.spotify.com/v1/artists?ids={ids_string}"
-        headers = self.get_auth_header()
-        
         try:
-            result = requests.get(url, headers=headers)
-            result.raise_for_status()
-            json_result = json.loads(result.content)
+            response = ARTISTS_DECODER.decode(self._get(SPOTIFY_ARTISTS_URL + ",".join(artist_ids)))
             
             batch_results = {}
-            artists = json_result.get("artists", [])
             
-            for i, artist in enumerate(artists):
+            for i, artist in enumerate(response.artists):
                 artist_id = artist_ids[i]
                 if artist is None:
                     batch_results[artist_id] = {
@@ -194,11 +356,11 @@ class SpotifyAPI:
                         "error_message": "Artist not found or not available"
                     }
                 else:
-                    name = artist.get("name")
-                    uri = artist.get("uri")
-                    genres = ", ".join(artist.get("genres", []))
-                    followers = artist.get("followers", {}).get("total")
-                    popularity = artist.get("popularity")
+                    name = artist.name
+                    uri = artist.uri
+                    genres = ", ".join(artist.genres)
+                    followers = artist.followers.total if artist.followers else None
+                    popularity = artist.popularity
                     
                     batch_results[artist_id] = {
                         "name": name,
@@ -229,12 +391,10 @@ class SpotifyAPI:
 
     def extract_year_from_release_date(self, release_date: str) -> int:
         """Extract year from release date string"""
-        if not release_date:
-            return None
-        
-        match = re.match(r'^(\d{4})', release_date)
-        if match:
-            return int(match.group(1))
+        # Spotify release dates are YYYY, YYYY-MM or YYYY-MM-DD
+        year = release_date[:4] if release_date else None
+        if year and len(year) == 4 and year.isdecimal():
+            return int(year)
         return None
 
 class ContentProcessor:
@@ -247,8 +407,20 @@ class ContentProcessor:
         try:
             collection = self.db[STREAMING_COLLECTION]
             
-            # Get most recent records sorted by timestamp descending
-            records = list(collection.find().sort("ts_utc", -1).limit(limit))
+            # Get most recent records sorted by timestamp descending, projecting only the fields
+            # identify_new_content uses (the ts_utc index from ensure_indexes backs the sort)
+            records = list(collection.find(
+                {},
+                {"track_name": 1, "artist_name": 1, "spotify_track_uri": 1, "_id": 0}
+            ).sort("ts_utc", -1).limit(limit))
+            
+            # Normalize names once here so dedup lookups and matching reuse the keys
+            for record in records:
+                track_name = record.get("track_name")
+                artist_name = record.get("artist_name")
+                if track_name and artist_name:
+                    record["norm_song_key"] = make_song_key(track_name, artist_name)
+                    record["norm_artist_key"] = normalize_name(artist_name)
             
             logger.info(f"✅ Retrieved {len(records)} recent streaming records")
             return records
@@ -257,30 +429,117 @@ class ContentProcessor:
             logger.error(f"Error getting streaming records: {e}")
             return []
 
-    def get_existing_master_data(self):
-        """Get existing songs and artists from master collections"""
+    def ensure_indexes(self):
+        """Backfill normalized keys on master documents and create the indexes lookups rely on"""
+        self.db[STREAMING_COLLECTION].create_index("ts_utc")
+        
+        songs_collection = self.db[SONGS_MASTER_COLLECTION]
+        artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
+        
+        # Documents without names get no key, so the partial unique index leaves them out
+        song_ops = [
+            UpdateOne({"_id": song["_id"]}, {"$set": {"norm_song_key": make_song_key(song.get("song_name"), song.get("artist_name"))}})
+            for song in songs_collection.find({"norm_song_key": {"$exists": False}}, {"song_name": 1, "artist_name": 1})
+            if song.get("song_name") and song.get("artist_name")
+        ]
+        if song_ops:
+            songs_collection.bulk_write(song_ops, ordered=False)
+            logger.info(f"🔑 Backfilled norm_song_key on {len(song_ops)} songs")
+        
+        artist_ops = [
+            UpdateOne({"_id": artist["_id"]}, {"$set": {"norm_artist_key": normalize_name(artist.get("artist_name"))}})
+            for artist in artists_collection.find({"norm_artist_key": {"$exists": False}}, {"artist_name": 1})
+            if artist.get("artist_name")
+        ]
+        if artist_ops:
+            artists_collection.bulk_write(artist_ops, ordered=False)
+            logger.info(f"🔑 Backfilled norm_artist_key on {len(artist_ops)} artists")
+        
+        self._ensure_unique_index(songs_collection, "norm_song_key")
+        self._ensure_unique_index(artists_collection, "norm_artist_key")
+
+    @staticmethod
+    def _ensure_unique_index(collection, field: str):
+        """Create a partial unique index on field, keeping a plain index (and retrying next run) while duplicates exist"""
+        unique_name = f"{field}_unique"
+        fallback_name = f"{field}_1"
+        indexes = collection.index_information()
+        if unique_name in indexes:
+            return
+        
+        try:
+            # Only string keys are indexed, so documents the backfill could not key never collide
+            collection.create_index(field, name=unique_name, unique=True,
+                                    partialFilterExpression={field: {"$type": "string"}})
+        except OperationFailure as e:
+            duplicates = list(collection.aggregate([
+                {"$match": {field: {"$type": "string"}}},
+                {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+                {"$limit": 10}
+            ]))
+            logger.warning(f"Could not create unique index on {collection.name}.{field}: {e}")
+            for duplicate in duplicates:
+                logger.warning(f"  ⚠️ Duplicate {field} '{duplicate['_id']}' on {duplicate['count']} documents")
+            # Keep lookups indexed until the duplicates are cleaned up; the unique build is retried next run
+            collection.create_index(field, name=fallback_name)
+            return
+        
+        # The unique index now serves lookups, so the plain (or older non-partial) index is redundant
+        if fallback_name in indexes:
+            collection.drop_index(fallback_name)
+
+    @staticmethod
+    def _insert_missing(collection, key_field: str, documents) -> int:
+        """Upsert documents by their normalized key so ones that already exist are left untouched"""
+        operations = [
+            UpdateOne({key_field: document[key_field]}, {"$setOnInsert": document}, upsert=True)
+            for document in documents
+        ]
+        result = collection.bulk_write(operations, ordered=False)
+        skipped = len(documents) - result.upserted_count
+        if skipped:
+            logger.info(f"Skipped {skipped} documents already in {collection.name}")
+        return result.upserted_count
+
+    def get_existing_master_data(self, streaming_records):
+        """Get which songs and artists from the streaming records already exist in master collections"""
         try:
             songs_collection = self.db[SONGS_MASTER_COLLECTION]
             artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
             
-            # Get all existing songs (using song_name + artist_name as key)
-            existing_songs = {}
-            for song in songs_collection.find({}, {"song_name": 1, "artist_name": 1}):
-                key = (song["song_name"].lower().strip(), song["artist_name"].lower().strip())
-                existing_songs[key] = True
+            # Only look up the keys of the streaming records, not the whole collections
+            candidate_songs = {record["norm_song_key"] for record in streaming_records if "norm_song_key" in record}
+            candidate_artists = {record["norm_artist_key"] for record in streaming_records if "norm_artist_key" in record}
             
-            # Get all existing artists (using artist_name as key)
-            existing_artists = {}
-            for artist in artists_collection.find({}, {"artist_name": 1}):
-                key = artist["artist_name"].lower().strip()
-                existing_artists[key] = True
+            # One round-trip for both collections: match songs, then $unionWith the artist match.
+            # Each branch leads with an $in on its key index and projects only that key (no _id)
+            pipeline = [
+                {"$match": {"norm_song_key": {"$in": list(candidate_songs)}}},
+                {"$project": {"norm_song_key": 1, "_id": 0}},
+                {"$unionWith": {
+                    "coll": artists_collection.name,
+                    "pipeline": [
+                        {"$match": {"norm_artist_key": {"$in": list(candidate_artists)}}},
+                        {"$project": {"norm_artist_key": 1, "_id": 0}}
+                    ]
+                }}
+            ]
             
-            logger.info(f"✅ Found {len(existing_songs)} existing songs and {len(existing_artists)} existing artists in master collections")
+            existing_songs = set()
+            existing_artists = set()
+            for doc in songs_collection.aggregate(pipeline):
+                if "norm_song_key" in doc:
+                    existing_songs.add(doc["norm_song_key"])
+                else:
+                    existing_artists.add(doc["norm_artist_key"])
+            
+            logger.info(f"✅ Found {len(existing_songs)}/{len(candidate_songs)} recent songs and {len(existing_artists)}/{len(candidate_artists)} recent artists in master collections")
             return existing_songs, existing_artists
             
         except Exception as e:
             logger.error(f"Error getting existing master data: {e}")
-            return {}, {}
+            return set(), set()
 
     def identify_new_content(self, streaming_records, existing_songs, existing_artists):
         """Identify new songs and artists from streaming records"""
@@ -296,7 +555,7 @@ class ContentProcessor:
                 continue
             
             # Check for new songs
-            song_key = (track_name.lower().strip(), artist_name.lower().strip())
+            song_key = record["norm_song_key"]
             if song_key not in existing_songs and song_key not in new_songs:
                 new_songs[song_key] = {
                     "song_name": track_name,
@@ -305,7 +564,7 @@ class ContentProcessor:
                 }
             
             # Check for new artists
-            artist_key = artist_name.lower().strip()
+            artist_key = record["norm_artist_key"]
             if artist_key not in existing_artists and artist_key not in new_artists:
                 new_artists[artist_key] = {
                     "artist_name": artist_name,
@@ -342,8 +601,7 @@ class ContentProcessor:
         track_ids = [song['spotify_track_uri'] for song in new_songs]
         
         # Get Spotify details for all tracks
-        batch_results = self.spotify_api.get_batch_track_details(track_ids)
-        time.sleep(REQUEST_DELAY)
+        batch_results = self.spotify_api.get_track_details(track_ids)
         
         # Process each song
         songs_to_insert = []
@@ -388,13 +646,13 @@ class ContentProcessor:
                 }
                 logger.warning(f"  ⚠️ {i+1}/{len(new_songs)}: '{song['song_name']}' by {song['artist_name']} - {spotify_result['error_message']}")
             
+            song_record["norm_song_key"] = make_song_key(song['song_name'], song['artist_name'])
             songs_to_insert.append(song_record)
         
         # Insert new songs
         if songs_to_insert:
             songs_collection = self.db[SONGS_MASTER_COLLECTION]
-            result = songs_collection.insert_many(songs_to_insert)
-            inserted_count = len(result.inserted_ids)
+            inserted_count = self._insert_missing(songs_collection, "norm_song_key", songs_to_insert)
             logger.info(f"✅ Inserted {inserted_count} new songs into {SONGS_MASTER_COLLECTION}")
             return inserted_count
         
@@ -410,30 +668,27 @@ class ContentProcessor:
         
         # We need to get artist IDs from track data first
         track_ids = [artist['spotify_track_uri'] for artist in new_artists]
-        track_results = self.spotify_api.get_batch_track_details(track_ids)
-        time.sleep(REQUEST_DELAY)
+        track_results = self.spotify_api.get_track_details(track_ids)
         
-        # Map artist names to their IDs
+        # Map artist names to their IDs in one sweep over the fetched tracks' artists
+        wanted = {normalize_name(artist['artist_name']): artist['artist_name'] for artist in new_artists}
         artist_id_mapping = {}
-        for i, artist in enumerate(new_artists):
-            track_uri = artist['spotify_track_uri']
-            track_result = track_results[track_uri]
+        for track_result in track_results.values():
+            if track_result['status'] != 'success':
+                continue
             
-            if track_result['status'] == 'success':
-                # Find the matching artist from the track's artists
-                for artist_info in track_result['artists']:
-                    if artist_info['name'].lower().strip() == artist['artist_name'].lower().strip():
-                        artist_id_mapping[artist['artist_name']] = {
-                            'id': artist_info['id'],
-                            'uri': artist_info['uri']
-                        }
-                        break
+            for artist_info in track_result['artists']:
+                artist_name = wanted.get(normalize_name(artist_info['name']))
+                if artist_name and artist_name not in artist_id_mapping:
+                    artist_id_mapping[artist_name] = {
+                        'id': artist_info['id'],
+                        'uri': artist_info['uri']
+                    }
         
         # Get artist details from Spotify
         artist_ids = [info['id'] for info in artist_id_mapping.values()]
         if artist_ids:
-            artist_results = self.spotify_api.get_batch_artist_details(artist_ids)
-            time.sleep(REQUEST_DELAY)
+            artist_results = self.spotify_api.get_artist_details(artist_ids)
         else:
             artist_results = {}
         
@@ -487,13 +742,13 @@ class ContentProcessor:
                 }
                 logger.warning(f"  ⚠️ {i+1}/{len(new_artists)}: {artist_name} - Could not get artist ID from track")
             
+            artist_record["norm_artist_key"] = normalize_name(artist_name)
             artists_to_insert.append(artist_record)
         
         # Insert new artists
         if artists_to_insert:
             artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
-            result = artists_collection.insert_many(artists_to_insert)
-            inserted_count = len(result.inserted_ids)
+            inserted_count = self._insert_missing(artists_collection, "norm_artist_key", artists_to_insert)
             logger.info(f"✅ Inserted {inserted_count} new artists into {ARTISTS_MASTER_COLLECTION}")
             return inserted_count
         
@@ -527,6 +782,7 @@ def main():
     try:
         db = client[DATABASE_NAME]
         processor = ContentProcessor(db)
+        processor.ensure_indexes()
         
         # Get recent streaming records (last 50)
         streaming_records = processor.get_recent_streaming_records(limit=50)
@@ -535,7 +791,7 @@ def main():
             return
         
         # Get existing songs and artists from master collections
-        existing_songs, existing_artists = processor.get_existing_master_data()
+        existing_songs, existing_artists = processor.get_existing_master_data(streaming_records)
         
         # Identify new songs and artists
         new_songs, new_artists = processor.identify_new_content(
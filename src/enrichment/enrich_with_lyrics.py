@@ -9,7 +9,7 @@ Artist languages are now only updated when new artists are processed, not every
 
 Processing Flow:
 1. Find unprocessed songs (has_lyrics: null)
-2. For each song: fetch lyrics → update database → detect language → update database
+2. For each chunk of songs: fetch lyrics concurrently → detect language → bulk update database
 3. Handle soundtrack classification
 4. Skip artist conflict resolution (moved to separate weekly script)
 
@@ -20,26 +20,38 @@ Collections:
 
 import os
 import re
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Tuple, Dict, List
 from datetime import datetime
 from collections import Counter
+from functools import lru_cache
+from itertools import islice
 import lyricsgenius
-from langdetect import detect_langs
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from langdetect import DetectorFactory, detect_langs
 from langdetect.lang_detect_exception import LangDetectException
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.cursor import Cursor
 from dotenv import load_dotenv
 import logging
 
 # Load environment variables
 load_dotenv()
 
+# Make langdetect's sampling deterministic so reruns classify songs the same way
+DetectorFactory.seed = 0
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('enrichment.enrich_with_lyrics')
+LOG_LEVEL = (os.getenv('LOG_LEVEL') or 'INFO').upper()  # LOG_LEVEL=DEBUG shows per-song detail
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    LOG_LEVEL = 'INFO'  # Unknown or empty values fall back instead of failing at import
+logger.setLevel(LOG_LEVEL)
 
 # Configuration
 DATABASE_NAME = "Spotify"
@@ -53,16 +65,13 @@ GENIUS_TOKEN = os.getenv('GENIUS_TOKEN')
 # Language Detection Configuration
 CONFIDENCE_THRESHOLD = 70.0  # Minimum confidence for language detection (0-100)
 MIN_LYRICS_LENGTH = 100      # Minimum characters for lyrics to be considered valid
+MAX_DETECTION_CHARS = 2000   # Text beyond this adds cost but not accuracy to language detection
+MAX_CACHED_DETECTION_CHARS = 200  # Titles/artist names repeat across songs and are memoized; lyrics are not
+GENIUS_MAX_WORKERS = 4       # Concurrent Genius lookups
+GENIUS_TIMEOUT = 10          # Seconds before a Genius request is abandoned
 
-# Soundtrack/Orchestral/Non-vocal genres (exact matches only)
-SOUNDTRACK_GENRES = {
-    'soundtrack', 'japanese vgm', 'classical', 'orchestra', 'classical piano', 
-    'neoclassical', 'chamber music', 'minimalism', 'requiem', 'choral', 
-    'ragtime', 'ambient', 'drone', 'space music', 'new age', 'medieval', 
-    'sea shanties', 'traditional music', 'traditional folk', 'japanese classical', 
-    'polka', 'tango', 'bolero', 'exotica', 'easy listening', 'gregorian chant',
-    'avant-garde', 'lounge', 'downtempo', 'breakbeat', 'idm'
-}
+# Database Write Configuration
+SONG_UPDATE_BATCH_SIZE = 100 # Songs per processing chunk / bulk_write round-trip
 
 # Top film composers (exact name matches only)
 FILM_COMPOSERS = {
@@ -130,6 +139,9 @@ CLASSICAL_COMPOSERS = {
     'david lang', 'julia wolfe', 'michael gordon'
 }
 
+# All known composers, merged so composer checks are a single hash lookup
+KNOWN_COMPOSERS = frozenset(FILM_COMPOSERS | CLASSICAL_COMPOSERS)
+
 # Orchestra/ensemble keywords for word matching (single words only)
 ORCHESTRA_KEYWORDS = {
     'orchestra', 'symphony', 'philharmonic', 'ensemble', 'quartet', 'quintet',
@@ -138,88 +150,68 @@ ORCHESTRA_KEYWORDS = {
     'brass', 'woodwinds', 'percussion', 'conducting', 'conductor'
 }
 
+# langdetect codes → readable language names
+LANGUAGE_NAMES = {
+    'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German',
+    'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
+    'ko': 'Korean', 'zh-cn': 'Chinese', 'zh': 'Chinese', 'ar': 'Arabic',
+    'tr': 'Turkish', 'nl': 'Dutch', 'pl': 'Polish', 'sv': 'Swedish',
+    'no': 'Norwegian', 'da': 'Danish', 'fi': 'Finnish', 'he': 'Hebrew',
+    'hi': 'Hindi', 'th': 'Thai', 'vi': 'Vietnamese', 'id': 'Indonesian',
+    'ms': 'Malay', 'tl': 'Filipino', 'ro': 'Romanian', 'hu': 'Hungarian',
+    'cs': 'Czech', 'sk': 'Slovak', 'bg': 'Bulgarian', 'hr': 'Croatian',
+    'sr': 'Serbian', 'sl': 'Slovenian', 'et': 'Estonian', 'lv': 'Latvian',
+    'lt': 'Lithuanian', 'uk': 'Ukrainian', 'be': 'Belarusian',
+    'mk': 'Macedonian', 'sq': 'Albanian', 'ca': 'Catalan', 'eu': 'Basque',
+    'gl': 'Galician', 'cy': 'Welsh', 'ga': 'Irish', 'is': 'Icelandic',
+    'mt': 'Maltese'
+}
+
+# Character/word patterns (compiled once at import)
+HEBREW_RE = re.compile(r'[\u0590-\u05FF\uFB1D-\uFB4F]')
+JAPANESE_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')  # Hiragana, Katakana, Kanji
+WORD_RE = re.compile(r'\b\w+\b')
+SECTION_HEADER_RE = re.compile(r'\[[^\]]*\]')  # Genius annotations like [Chorus] / [Verse 1: Artist]
+
 class LanguageDetector:
     def __init__(self):
         pass
     
     def detect_hebrew_chars(self, text: str) -> bool:
         """Check if text contains Hebrew characters."""
-        if not text:
+        # Pure-ASCII text (most titles) can't contain Hebrew - skip the regex scan
+        if not text or text.isascii():
             return False
         
-        hebrew_pattern = re.compile(r'[\u0590-\u05FF\uFB1D-\uFB4F]')
-        return bool(hebrew_pattern.search(text))
+        return bool(HEBREW_RE.search(text))
     
     def detect_japanese_chars(self, text: str) -> bool:
         """Check if text contains Japanese characters (Hiragana, Katakana, Kanji)."""
-        if not text:
+        if not text or text.isascii():
             return False
         
-        # Hiragana: U+3040–U+309F, Katakana: U+30A0–U+30FF, Kanji: U+4E00–U+9FAF
-        japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-        return bool(japanese_pattern.search(text))
-    
-    def detect_language_ml(self, text: str) -> Tuple[Optional[str], float]:
-        """Use machine learning to detect language with confidence score."""
-        if not text or len(text.strip()) < 3:
-            return None, 0.0
-        
-        try:
-            lang_probs = detect_langs(text)
-            if lang_probs:
-                best_lang = lang_probs[0]
-                confidence_percent = best_lang.prob * 100
-                return best_lang.lang, confidence_percent
-            return None, 0.0
-        except (LangDetectException, Exception):
-            return None, 0.0
+        return bool(JAPANESE_RE.search(text))
     
     def normalize_language_code(self, lang_code: str) -> str:
         """Convert language codes to readable names."""
-        lang_map = {
-            'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German',
-            'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
-            'ko': 'Korean', 'zh-cn': 'Chinese', 'zh': 'Chinese', 'ar': 'Arabic',
-            'tr': 'Turkish', 'nl': 'Dutch', 'pl': 'Polish', 'sv': 'Swedish',
-            'no': 'Norwegian', 'da': 'Danish', 'fi': 'Finnish', 'he': 'Hebrew',
-            'hi': 'Hindi', 'th': 'Thai', 'vi': 'Vietnamese', 'id': 'Indonesian',
-            'ms': 'Malay', 'tl': 'Filipino', 'ro': 'Romanian', 'hu': 'Hungarian',
-            'cs': 'Czech', 'sk': 'Slovak', 'bg': 'Bulgarian', 'hr': 'Croatian',
-            'sr': 'Serbian', 'sl': 'Slovenian', 'et': 'Estonian', 'lv': 'Latvian',
-            'lt': 'Lithuanian', 'uk': 'Ukrainian', 'be': 'Belarusian',
-            'mk': 'Macedonian', 'sq': 'Albanian', 'ca': 'Catalan', 'eu': 'Basque',
-            'gl': 'Galician', 'cy': 'Welsh', 'ga': 'Irish', 'is': 'Icelandic',
-            'mt': 'Maltese'
-        }
-        return lang_map.get(lang_code, lang_code.title() if lang_code else 'Unknown')
+        return LANGUAGE_NAMES.get(lang_code, lang_code.title() if lang_code else 'Unknown')
 
 class SoundtrackClassifier:
     @staticmethod
-    def contains_soundtrack_genre(genres: str) -> bool:
-        """Check if any genre matches soundtrack genres"""
-        if not genres:
+    def is_known_composer(artist_lower: str) -> bool:
+        """Check if an already lowercased/stripped artist name exactly matches known composers"""
+        if not artist_lower:
             return False
         
-        genre_list = [genre.strip().lower() for genre in str(genres).split(',')]
-        return any(genre in SOUNDTRACK_GENRES for genre in genre_list)
+        return artist_lower in KNOWN_COMPOSERS
 
     @staticmethod
-    def is_known_composer(artist_name: str) -> bool:
-        """Check if artist name exactly matches known composers"""
-        if not artist_name:
+    def contains_orchestra_keywords(text_lower: str) -> bool:
+        """Check if already lowercased text contains orchestra keywords as complete words"""
+        if not text_lower:
             return False
         
-        normalized_name = artist_name.lower().strip()
-        return normalized_name in FILM_COMPOSERS or normalized_name in CLASSICAL_COMPOSERS
-
-    @staticmethod
-    def contains_orchestra_keywords(text: str) -> bool:
-        """Check if text contains orchestra keywords as complete words"""
-        if not text:
-            return False
-        
-        words = re.findall(r'\b\w+\b', text.lower())
-        return any(word in ORCHESTRA_KEYWORDS for word in words)
+        return not ORCHESTRA_KEYWORDS.isdisjoint(WORD_RE.findall(text_lower))
 
 def connect_to_mongodb():
     """Connect to MongoDB Atlas"""
@@ -244,25 +236,57 @@ def initialize_genius_api():
         return None
     
     try:
-        genius = lyricsgenius.Genius(GENIUS_TOKEN)
+        genius = lyricsgenius.Genius(GENIUS_TOKEN, timeout=GENIUS_TIMEOUT)
         genius.verbose = False  # Reduce API output noise
         genius.remove_section_headers = False  # Keep original formatting
+        
+        # Keep-alive pool sized for the concurrent fetchers, retrying rate-limited/failed requests
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=GENIUS_MAX_WORKERS, max_retries=retry)
+        # _session is lyricsgenius-internal (version pinned in requirements.txt) - skip the adapter if it moves
+        session = getattr(genius, "_session", None)
+        if session is not None:
+            session.mount("https://", adapter)
+        else:
+            logger.warning("lyricsgenius client has no _session; Genius requests will run without the retry adapter")
         logger.info("✅ Successfully connected to Genius API")
         return genius
     except Exception as e:
         logger.error(f"Error initializing Genius API: {e}")
         return None
 
-def get_unprocessed_songs(db):
-    """Get songs with has_lyrics: null (unprocessed songs)"""
+def ensure_indexes(db):
+    """Create the indexes behind the unprocessed-song, soundtrack-fix and dashboard release-year queries (no-op if they exist)"""
+    try:
+        songs_collection = db[SONGS_MASTER_COLLECTION]
+        songs_collection.create_index("has_lyrics")
+        songs_collection.create_index([("is_soundtrack", 1), ("language", 1)])
+        songs_collection.create_index("release_date_year")  # Dashboard's songs-by-release-year lookup
+        db[ARTISTS_MASTER_COLLECTION].create_index([("is_soundtrack", 1), ("language", 1)])
+    except Exception as e:
+        logger.warning(f"Could not create indexes: {e}")
+
+def get_unprocessed_songs(db) -> Tuple[int, Optional[Cursor]]:
+    """Get a count and a streaming cursor over songs with has_lyrics: null (unprocessed songs)"""
     try:
         collection = db[SONGS_MASTER_COLLECTION]
-        songs = list(collection.find({"has_lyrics": None}))
-        logger.info(f"✅ Found {len(songs)} unprocessed songs")
-        return songs
+        total = collection.count_documents({"has_lyrics": None})
+        logger.info(f"✅ Found {total} unprocessed songs")
+        
+        # Only the fields processing reads; batches match the processing chunk size
+        songs = collection.find(
+            {"has_lyrics": None},
+            {"_id": 1, "song_name": 1, "artist_name": 1}
+        ).batch_size(SONG_UPDATE_BATCH_SIZE)
+        return total, songs
     except Exception as e:
         logger.error(f"Error getting unprocessed songs: {e}")
-        return []
+        return 0, None
 
 def fetch_lyrics(genius, song_name: str, artist_name: str) -> Tuple[Optional[str], bool]:
     """
@@ -293,7 +317,44 @@ def fetch_lyrics(genius, song_name: str, artist_name: str) -> Tuple[Optional[str
         logger.debug(f"❌ Error fetching lyrics: {e}")
         return None, False
 
-def detect_song_language(detector, song_data, lyrics: Optional[str]) -> Tuple[str, str]:
+def _has_letters(text: str, minimum: int = 3) -> bool:
+    """Check if text has at least `minimum` alphabetic characters (anything less can't be detected)"""
+    count = 0
+    for char in text:
+        if char.isalpha():
+            count += 1
+            if count >= minimum:
+                return True
+    return False
+
+def _detect_language(text: str) -> Tuple[Optional[str], float]:
+    """Run langdetect on text and return its best language with confidence score."""
+    try:
+        lang_probs = detect_langs(text)
+        if lang_probs:
+            best_lang = lang_probs[0]
+            confidence_percent = best_lang.prob * 100
+            return best_lang.lang, confidence_percent
+        return None, 0.0
+    except (LangDetectException, Exception):
+        return None, 0.0
+
+@lru_cache(maxsize=4096)
+def _detect_short_text_language(text: str) -> Tuple[Optional[str], float]:
+    """Memoized language detection for short texts (titles and artist names)"""
+    return _detect_language(text)
+
+def detect_language_ml(text: str) -> Tuple[Optional[str], float]:
+    """Use machine learning to detect language with confidence score."""
+    if not text or len(text.strip()) < 3:
+        return None, 0.0
+    
+    text = text[:MAX_DETECTION_CHARS]
+    if len(text) <= MAX_CACHED_DETECTION_CHARS:
+        return _detect_short_text_language(text)
+    return _detect_language(text)
+
+def detect_song_language(detector, song_data, lyrics: Optional[str], is_soundtrack: bool) -> Tuple[str, str]:
     """
     Detect language for a song following priority: Soundtrack > Hebrew > Japanese > Lyrics > Title
     Returns: (language, detection_method)
@@ -302,7 +363,6 @@ def detect_song_language(detector, song_data, lyrics: Optional[str]) -> Tuple[st
     artist_name = song_data.get('artist_name', '')
     
     # Step 1: Check if it's soundtrack (highest priority)
-    is_soundtrack = song_data.get('is_soundtrack', False)
     if is_soundtrack:
         return "Soundtrack", "soundtrack"
     
@@ -315,98 +375,118 @@ def detect_song_language(detector, song_data, lyrics: Optional[str]) -> Tuple[st
     if detector.detect_japanese_chars(combined_text):
         return "Japanese", "character_detection"
     
-    # Step 4: Try lyrics if available
-    if lyrics and len(lyrics.strip()) >= MIN_LYRICS_LENGTH:
-        lang, confidence = detector.detect_language_ml(lyrics)
-        if lang and confidence >= CONFIDENCE_THRESHOLD:
-            return detector.normalize_language_code(lang), "lyrics"
+    # Steps 4-6: Try lyrics, then song title, then artist name - first confident detection wins
+    candidates = []
+    if lyrics:
+        # Section headers are English regardless of the song's language - keep them out of detection
+        lyrics = SECTION_HEADER_RE.sub('', lyrics)
+        if len(lyrics.strip()) >= MIN_LYRICS_LENGTH:
+            candidates.append((lyrics, "lyrics"))
+    candidates.append((song_name, "title"))
+    candidates.append((artist_name, "artist_name"))
     
-    # Step 5: Try song title
-    if song_name:
-        lang, confidence = detector.detect_language_ml(song_name)
+    for text, method in candidates:
+        if not text or not _has_letters(text):
+            continue
+        lang, confidence = detect_language_ml(text)
         if lang and confidence >= CONFIDENCE_THRESHOLD:
-            return detector.normalize_language_code(lang), "title"
-    
-    # Step 6: Try artist name
-    if artist_name:
-        lang, confidence = detector.detect_language_ml(artist_name)
-        if lang and confidence >= CONFIDENCE_THRESHOLD:
-            return detector.normalize_language_code(lang), "artist_name"
+            return detector.normalize_language_code(lang), method
     
     return "Unknown", "unknown"
 
+@lru_cache(maxsize=None)
+def is_soundtrack_artist(artist_lower: str) -> bool:
+    """Check the artist-only soundtrack signals once per artist (expects an already lowercased/stripped name)"""
+    # Check if artist is a known composer, or artist name contains orchestra keywords
+    return SoundtrackClassifier.is_known_composer(artist_lower) or SoundtrackClassifier.contains_orchestra_keywords(artist_lower)
+
 def classify_soundtrack(song_data) -> bool:
     """Classify if a song is soundtrack based on artist info"""
-    artist_name = song_data.get('artist_name', '')
-    song_name = song_data.get('song_name', '')
+    # Normalize each name once; the helpers below work on the lowercased strings directly
+    artist_lower = (song_data.get('artist_name') or '').lower().strip()
+    song_lower = (song_data.get('song_name') or '').lower()
     
-    # Check if artist is a known composer
-    if SoundtrackClassifier.is_known_composer(artist_name):
+    if is_soundtrack_artist(artist_lower):
         return True
     
-    # Check if artist/song name contains orchestra keywords
-    if SoundtrackClassifier.contains_orchestra_keywords(f"{artist_name} {song_name}"):
-        return True
+    # Check if song name contains orchestra keywords
+    return SoundtrackClassifier.contains_orchestra_keywords(song_lower)
+
+def start_chunk(executor, genius, chunk: List[Dict]) -> Tuple[List[bool], Dict[int, Future]]:
+    """Classify a chunk of songs as soundtrack and start fetching lyrics for the rest"""
+    # Step 1: Classify as soundtrack
+    soundtrack_flags = [classify_soundtrack(song) for song in chunk]
     
-    return False
+    # Step 2: Start lyrics fetches (skip soundtracks)
+    lyrics_futures = {
+        index: executor.submit(fetch_lyrics, genius, song.get('song_name', ''), song.get('artist_name', ''))
+        for index, song in enumerate(chunk)
+        if not soundtrack_flags[index]
+    }
+    return soundtrack_flags, lyrics_futures
+
+def build_song_update(song_id, lyrics: Optional[str], has_lyrics: bool,
+                      language: str, detection_method: str, is_soundtrack: bool) -> UpdateOne:
+    """Build the database update for a processed song"""
+    update_data = {
+        "has_lyrics": has_lyrics,
+        "language": language,
+        "detection_method": detection_method,
+        "is_soundtrack": is_soundtrack
+    }
+    
+    # Add lyrics if they exist
+    if lyrics:
+        update_data["lyrics"] = lyrics
+    
+    return UpdateOne({"_id": song_id}, {"$set": update_data})
 
-def update_song_in_db(db, song_id, lyrics: Optional[str], has_lyrics: bool, 
-                     language: str, detection_method: str, is_soundtrack: bool):
-    """Update song record in database"""
+def flush_song_updates(db, pending_ops: List[UpdateOne]) -> Optional[int]:
+    """Write buffered song updates in one unordered bulk_write and clear the buffer (None if the write failed)"""
+    if not pending_ops:
+        return 0
+    
     try:
-        collection = db[SONGS_MASTER_COLLECTION]
-        
-        update_data = {
-            "has_lyrics": has_lyrics,
-            "language": language,
-            "detection_method": detection_method,
-            "is_soundtrack": is_soundtrack
-        }
-        
-        # Add lyrics if they exist
-        if lyrics:
-            update_data["lyrics"] = lyrics
-        
-        result = collection.update_one(
-            {"_id": song_id},
-            {"$set": update_data}
-        )
-        
-        return result.modified_count > 0
-        
+        result = db[SONGS_MASTER_COLLECTION].bulk_write(pending_ops, ordered=False)
+        logger.debug(f"  💾 Saved {result.modified_count}/{len(pending_ops)} song updates to database")
+        return result.modified_count
     except Exception as e:
-        logger.error(f"Error updating song in database: {e}")
-        return False
+        logger.error(f"Error updating songs in database: {e}")
+        return None
+    finally:
+        pending_ops.clear()
 
-def update_new_artist_language(db, artist_name: str, language: str, detection_method: str):
-    """Update language for a NEW artist only (lightweight operation)"""
+def build_artist_language_update(artist_name: str, language: str, detection_method: str) -> UpdateOne:
+    """Build the language update for a NEW artist only (the filter skips artists that already have one)"""
+    return UpdateOne(
+        {
+            "artist_name": artist_name,
+            "$or": [
+                {"language": None},
+                {"language": "Unknown"},
+                {"language": {"$exists": False}}
+            ]
+        },
+        {"$set": {
+            "language": language,
+            "detection_method": detection_method
+        }}
+    )
+
+def flush_artist_updates(db, pending_ops: List[UpdateOne]) -> int:
+    """Write buffered artist language updates in one unordered bulk_write and clear the buffer"""
+    if not pending_ops:
+        return 0
+    
     try:
-        artists_collection = db[ARTISTS_MASTER_COLLECTION]
-        
-        # Only update if the artist exists and doesn't have a language set
-        result = artists_collection.update_one(
-            {
-                "artist_name": artist_name,
-                "$or": [
-                    {"language": None},
-                    {"language": "Unknown"},
-                    {"language": {"$exists": False}}
-                ]
-            },
-            {"$set": {
-                "language": language,
-                "detection_method": detection_method
-            }}
-        )
-        
-        if result.modified_count > 0:
-            logger.info(f"  🎭 Updated new artist language: {artist_name} → {language}")
-        
-        return result.modified_count > 0
-        
+        result = db[ARTISTS_MASTER_COLLECTION].bulk_write(pending_ops, ordered=False)
+        logger.info(f"🎭 Updated language for {result.modified_count}/{len(pending_ops)} new artists")
+        return result.modified_count
     except Exception as e:
-        logger.error(f"Error updating artist language: {e}")
-        return False
+        logger.error(f"Error updating artist languages: {e}")
+        return 0
+    finally:
+        pending_ops.clear()
 
 def fix_soundtrack_language_issues(db):
     """Fix existing soundtrack songs/artists that don't have language: 'Soundtrack'"""
@@ -416,47 +496,21 @@ def fix_soundtrack_language_issues(db):
         
         logger.info("🎬 Fixing soundtrack language issues...")
         
-        # Fix songs with is_soundtrack: true but language != "Soundtrack"
-        songs_fixed = 0
-        soundtrack_songs = songs_collection.find({
-            "is_soundtrack": True,
-            "language": {"$ne": "Soundtrack"}
-        })
+        soundtrack_filter = {"is_soundtrack": True, "language": {"$ne": "Soundtrack"}}
+        soundtrack_update = {"$set": {"language": "Soundtrack", "detection_method": "soundtrack"}}
         
-        for song in soundtrack_songs:
-            result = songs_collection.update_one(
-                {"_id": song["_id"]},
-                {"$set": {
-                    "language": "Soundtrack",
-                    "detection_method": "soundtrack"
-                }}
-            )
-            
-            if result.modified_count > 0:
-                songs_fixed += 1
-                old_lang = song.get('language', 'None')
-                logger.info(f"  🎬 SONG: '{song['song_name']}' by {song['artist_name']}: {old_lang} → Soundtrack")
+        # Fix songs with is_soundtrack: true but language != "Soundtrack"
+        # (log the affected documents from a projected read, then fix them all in one update_many)
+        for song in songs_collection.find(soundtrack_filter, {"song_name": 1, "artist_name": 1, "language": 1, "_id": 0}):
+            old_lang = song.get('language', 'None')
+            logger.info(f"  🎬 SONG: '{song.get('song_name')}' by {song.get('artist_name')}: {old_lang} → Soundtrack")
+        songs_fixed = songs_collection.update_many(soundtrack_filter, soundtrack_update).modified_count
         
         # Fix artists with is_soundtrack: true but language != "Soundtrack"
-        artists_fixed = 0
-        soundtrack_artists = artists_collection.find({
-            "is_soundtrack": True,
-            "language": {"$ne": "Soundtrack"}
-        })
-        
-        for artist in soundtrack_artists:
-            result = artists_collection.update_one(
-                {"_id": artist["_id"]},
-                {"$set": {
-                    "language": "Soundtrack",
-                    "detection_method": "soundtrack"
-                }}
-            )
-            
-            if result.modified_count > 0:
-                artists_fixed += 1
-                old_lang = artist.get('language', 'None')
-                logger.info(f"  🎭 ARTIST: {artist['artist_name']}: {old_lang} → Soundtrack")
+        for artist in artists_collection.find(soundtrack_filter, {"artist_name": 1, "language": 1, "_id": 0}):
+            old_lang = artist.get('language', 'None')
+            logger.info(f"  🎭 ARTIST: {artist.get('artist_name')}: {old_lang} → Soundtrack")
+        artists_fixed = artists_collection.update_many(soundtrack_filter, soundtrack_update).modified_count
         
         if songs_fixed == 0 and artists_fixed == 0:
             logger.info("  ✅ No soundtrack language issues found")
@@ -492,70 +546,91 @@ def main():
     
     try:
         db = client[DATABASE_NAME]
+        ensure_indexes(db)
         
         # Get unprocessed songs
-        unprocessed_songs = get_unprocessed_songs(db)
+        total_songs, unprocessed_songs = get_unprocessed_songs(db)
         
-        if not unprocessed_songs:
+        if not total_songs:
             logger.info("🎉 No unprocessed songs found! All songs have been processed.")
             return
         
-        logger.info(f"🔍 Processing {len(unprocessed_songs)} songs...")
+        logger.info(f"🔍 Processing {total_songs} songs...")
         
         processed_count = 0
         lyrics_found_count = 0
         soundtrack_count = 0
         new_artist_languages = set()
+        pending_ops = []
+        artist_ops = []
         
-        # Process each song individually
-        for i, song in enumerate(unprocessed_songs, 1):
-            song_id = song['_id']
-            song_name = song.get('song_name', '')
-            artist_name = song.get('artist_name', '')
-            
-            logger.info(f"[{i}/{len(unprocessed_songs)}] Processing: '{song_name}' by {artist_name}")
-            
-            # Step 1: Classify as soundtrack
-            is_soundtrack = classify_soundtrack(song)
-            if is_soundtrack:
-                soundtrack_count += 1
-                logger.info(f"  🎬 Classified as soundtrack")
-            
-            # Step 2: Fetch lyrics (skip if soundtrack)
-            lyrics = None
-            has_lyrics = False
-            
-            if not is_soundtrack:
-                lyrics, has_lyrics = fetch_lyrics(genius, song_name, artist_name)
-                if has_lyrics:
-                    lyrics_found_count += 1
-                time.sleep(0.1)  # Small delay between API calls
-            else:
-                logger.info(f"  🎬 Skipping lyrics fetch for soundtrack")
-                has_lyrics = False
-            
-            # Step 3: Detect language (pass the newly classified is_soundtrack value)
-            song_with_soundtrack = song.copy()
-            song_with_soundtrack['is_soundtrack'] = is_soundtrack
-            language, detection_method = detect_song_language(detector, song_with_soundtrack, lyrics)
-            logger.info(f"  🌍 Language detected: {language} (method: {detection_method})")
-            
-            # Step 4: Update database
-            success = update_song_in_db(
-                db, song_id, lyrics, has_lyrics, 
-                language, detection_method, is_soundtrack
-            )
+        # Process songs in chunks: Genius lookups for a chunk run concurrently,
+        # then each song is classified/detected in order and the chunk is written in one bulk_write
+        executor = ThreadPoolExecutor(max_workers=GENIUS_MAX_WORKERS)
+        try:
+            start = 0
+            chunk = list(islice(unprocessed_songs, SONG_UPDATE_BATCH_SIZE))
+            soundtrack_flags, lyrics_futures = start_chunk(executor, genius, chunk)
             
-            if success:
-                processed_count += 1
-                logger.info(f"  ✅ Updated in database")
+            while chunk:
+                chunk_artist_ops = {}  # Artist language updates, kept only if this chunk's songs are written
                 
-                # Step 5: Update artist language if it's a new artist with a detected language
-                if language not in ['Unknown', 'Soundtrack'] and artist_name not in new_artist_languages:
-                    update_new_artist_language(db, artist_name, language, detection_method)
-                    new_artist_languages.add(artist_name)
-            else:
-                logger.error(f"  ❌ Failed to update database")
+                # Queue the next chunk's fetches now so the workers stay busy while this chunk is
+                # detected and written - the CPU stage overlaps the Genius I/O instead of following it
+                next_chunk = list(islice(unprocessed_songs, SONG_UPDATE_BATCH_SIZE))
+                next_flags, next_futures = start_chunk(executor, genius, next_chunk)
+                
+                for index, song in enumerate(chunk):
+                    song_id = song['_id']
+                    song_name = song.get('song_name', '')
+                    artist_name = song.get('artist_name', '')
+                    is_soundtrack = soundtrack_flags[index]
+                    
+                    logger.debug(f"[{start + index + 1}/{total_songs}] Processing: '{song_name}' by {artist_name}")
+                    
+                    lyrics = None
+                    has_lyrics = False
+                    
+                    if is_soundtrack:
+                        soundtrack_count += 1
+                        logger.debug(f"  🎬 Classified as soundtrack, skipping lyrics fetch")
+                    else:
+                        lyrics, has_lyrics = lyrics_futures[index].result()
+                        if has_lyrics:
+                            lyrics_found_count += 1
+                    
+                    # Step 3: Detect language (with the newly classified is_soundtrack value)
+                    language, detection_method = detect_song_language(detector, song, lyrics, is_soundtrack)
+                    logger.debug(f"  🌍 Language detected: {language} (method: {detection_method})")
+                    
+                    # Step 4: Queue database update
+                    pending_ops.append(build_song_update(
+                        song_id, lyrics, has_lyrics,
+                        language, detection_method, is_soundtrack
+                    ))
+                    
+                    # Step 5: Queue artist language update if it's a new artist with a detected language
+                    if (language not in ['Unknown', 'Soundtrack'] and artist_name not in new_artist_languages
+                            and artist_name not in chunk_artist_ops):
+                        chunk_artist_ops[artist_name] = build_artist_language_update(artist_name, language, detection_method)
+                
+                # Write the chunk's updates in one round-trip
+                written = flush_song_updates(db, pending_ops)
+                if written is not None:
+                    processed_count += written
+                    artist_ops.extend(chunk_artist_ops.values())
+                    new_artist_languages.update(chunk_artist_ops)
+                start += len(chunk)
+                logger.info(f"📈 Progress: {start}/{total_songs} songs (lyrics found: {lyrics_found_count}, soundtracks: {soundtrack_count})")
+                chunk, soundtrack_flags, lyrics_futures = next_chunk, next_flags, next_futures
+        except BaseException:
+            # Don't wait for the next chunk's queued Genius fetches when processing fails
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        
+        # Write all new artist languages in one round-trip
+        artists_updated = flush_artist_updates(db, artist_ops)
         
         # Step 6: Fix any remaining soundtrack language issues (lightweight)
         fix_soundtrack_language_issues(db)
@@ -564,10 +639,10 @@ def main():
         logger.info("="*80)
         logger.info("PROCESSING COMPLETE!")
         logger.info("="*80)
-        logger.info(f"Songs processed: {processed_count}/{len(unprocessed_songs)}")
+        logger.info(f"Songs processed: {processed_count}/{total_songs}")
         logger.info(f"Lyrics found: {lyrics_found_count}")
         logger.info(f"Soundtracks identified: {soundtrack_count}")
-        logger.info(f"New artist languages updated: {len(new_artist_languages)}")
+        logger.info(f"New artist languages updated: {artists_updated}")
         logger.info(f"Language detection completed for all processed songs")
         logger.info("⚡ Artist conflict resolution skipped for performance")
         
@@ -14,8 +14,11 @@ Collections:
 """
 
 import os
-import re
+import json
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Set, Any
 from pymongo import MongoClient
@@ -29,11 +32,20 @@ DATABASE_NAME = "Spotify"
 STREAMING_COLLECTION = "StreamingHistory"
 SONGS_MASTER_COLLECTION = "songs_master"
 ARTISTS_MASTER_COLLECTION = "artists_master"
-BATCH_SIZE = 1000
+MAX_CONCURRENT_CHECKS = 8  # Read-only validation checks run in parallel
+QUERY_TIMEOUT_MS = 60_000  # Server-side time limit for each validation query
+AGGREGATE_OPTIONS = {"maxTimeMS": QUERY_TIMEOUT_MS, "allowDiskUse": True}
+
+# Character classes for script detection (literal characters for MongoDB's $regex)
+HEBREW_CHAR_CLASS = '[\u0590-\u05FF\uFB1D-\uFB4F]'
+JAPANESE_CHAR_CLASS = '[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]'  # Hiragana, Katakana, Kanji
 
 # MongoDB Configuration
 MONGODB_CONNECTION_STRING = os.getenv('MONGODB_CONNECTION_STRING')
 
+# Optional JSON Lines file that receives full error details (unset = log only)
+VALIDATION_ERRORS_FILE = os.getenv('VALIDATION_ERRORS_FILE')
+
 # Expected detection methods
 VALID_DETECTION_METHODS = {
     "lyrics", "title", "artist_name", "character_detection", 
@@ -45,83 +57,74 @@ logger = logging.getLogger(__name__)
 class DataValidator:
     def __init__(self, db):
         self.db = db
-        self.errors = []
+        # Collection handles built once and shared by every check
+        self.collections = {
+            name: db[name]
+            for name in (STREAMING_COLLECTION, SONGS_MASTER_COLLECTION, ARTISTS_MASTER_COLLECTION)
+        }
+        self.error_counts = Counter()  # Per-category totals; details go to the log (and optional sink)
         self.fixes_applied = 0
+        self.lock = threading.Lock()  # Checks run concurrently; guards error_counts and the sink
+        self.error_sink = open(VALIDATION_ERRORS_FILE, "a", encoding="utf-8") if VALIDATION_ERRORS_FILE else None
+    
+    def close(self):
+        """Close the error sink file, if one is open"""
+        if self.error_sink:
+            self.error_sink.close()
+            self.error_sink = None
         
     def log_error(self, category: str, error_type: str, details: Dict[str, Any]):
-        """Log an error to the errors list"""
-        self.errors.append({
-            "category": category,
-            "error_type": error_type,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        })
+        """Count an error and log its details (also appended as a JSON line when a sink file is set)"""
+        with self.lock:
+            self.error_counts[category] += 1
+            
+            if self.error_sink:
+                self.error_sink.write(json.dumps({
+                    "category": category,
+                    "error_type": error_type,
+                    "details": details,
+                    "timestamp": datetime.now().isoformat()
+                }, ensure_ascii=False, default=str) + "\n")
         
         # Also log to standard logger
-        logger.warning(f"{category} - {error_type}: {details}")
+        logger.warning("%s - %s: %s", category, error_type, details)
     
-    def detect_hebrew_chars(self, text: str) -> bool:
-        """Check if text contains Hebrew characters"""
-        if not text:
-            return False
-        hebrew_pattern = re.compile(r'[\u0590-\u05FF\uFB1D-\uFB4F]')
-        return bool(hebrew_pattern.search(text))
+    def ensure_indexes(self):
+        """Create the indexes the validation lookups rely on (no-op if they exist)"""
+        self.collections[STREAMING_COLLECTION].create_index("ts_utc")
+        self.collections[SONGS_MASTER_COLLECTION].create_index([("song_name", 1), ("artist_name", 1)])
+        self.collections[ARTISTS_MASTER_COLLECTION].create_index("artist_name")
     
-    def detect_japanese_chars(self, text: str) -> bool:
-        """Check if text contains Japanese characters"""
-        if not text:
-            return False
-        japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-        return bool(japanese_pattern.search(text))
+    @staticmethod
+    def count_matching(collection, filters: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Count documents matching each named filter in a single $facet pass over the collection"""
+        facet = {name: [{"$match": query}, {"$count": "n"}] for name, query in filters.items()}
+        result = next(collection.aggregate([{"$facet": facet}], **AGGREGATE_OPTIONS), {})
+        return {name: result[name][0]["n"] if result.get(name) else 0 for name in filters}
     
     def validate_soundtrack_consistency(self):
         """Validate and fix soundtrack language consistency"""
         logger.info("🎬 Validating soundtrack consistency...")
         
-        songs_collection = self.db[SONGS_MASTER_COLLECTION]
-        artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
+        songs_collection = self.collections[SONGS_MASTER_COLLECTION]
+        artists_collection = self.collections[ARTISTS_MASTER_COLLECTION]
+        
+        soundtrack_filter = {"is_soundtrack": True, "language": {"$ne": "Soundtrack"}}
+        soundtrack_update = {"$set": {"language": "Soundtrack", "detection_method": "soundtrack"}}
         
         # Check songs with is_soundtrack: true but language != "Soundtrack"
-        songs_to_fix = list(songs_collection.find({
-            "is_soundtrack": True,
-            "language": {"$ne": "Soundtrack"}
-        }))
-        
-        for song in songs_to_fix:
-            # Fix in database
-            result = songs_collection.update_one(
-                {"_id": song["_id"]},
-                {"$set": {
-                    "language": "Soundtrack",
-                    "detection_method": "soundtrack"
-                }}
-            )
-            
-            if result.modified_count > 0:
-                self.fixes_applied += 1
-                logger.info(f"  🔧 FIXED SONG: '{song['song_name']}' by {song['artist_name']}: {song.get('language')} → Soundtrack")
+        # (log them from a projected read, then fix them all in one update_many)
+        for song in songs_collection.find(soundtrack_filter, {"song_name": 1, "artist_name": 1, "language": 1, "_id": 0}):
+            logger.info("  🔧 FIXED SONG: '%s' by %s: %s → Soundtrack", song.get('song_name'), song.get('artist_name'), song.get('language'))
+        songs_fixed = songs_collection.update_many(soundtrack_filter, soundtrack_update).modified_count
         
         # Check artists with is_soundtrack: true but language != "Soundtrack"
-        artists_to_fix = list(artists_collection.find({
-            "is_soundtrack": True,
-            "language": {"$ne": "Soundtrack"}
-        }))
-        
-        for artist in artists_to_fix:
-            # Fix in database
-            result = artists_collection.update_one(
-                {"_id": artist["_id"]},
-                {"$set": {
-                    "language": "Soundtrack",
-                    "detection_method": "soundtrack"
-                }}
-            )
-            
-            if result.modified_count > 0:
-                self.fixes_applied += 1
-                logger.info(f"  🔧 FIXED ARTIST: {artist['artist_name']}: {artist.get('language')} → Soundtrack")
+        for artist in artists_collection.find(soundtrack_filter, {"artist_name": 1, "language": 1, "_id": 0}):
+            logger.info("  🔧 FIXED ARTIST: %s: %s → Soundtrack", artist.get('artist_name'), artist.get('language'))
+        artists_fixed = artists_collection.update_many(soundtrack_filter, soundtrack_update).modified_count
         
-        logger.info(f"✅ Fixed {len(songs_to_fix)} songs and {len(artists_to_fix)} artists with soundtrack issues")
+        self.fixes_applied += songs_fixed + artists_fixed
+        logger.info(f"✅ Fixed {songs_fixed} songs and {artists_fixed} artists with soundtrack issues")
     
     def validate_required_fields(self):
         """Validate that required fields are not null/empty"""
@@ -134,11 +137,18 @@ class DataValidator:
         ]
         
         for collection_name, required_fields in collections_to_check:
-            collection = self.db[collection_name]
+            collection = self.collections[collection_name]
+            
+            # Count null and empty values for every field in one aggregation
+            filters = {}
+            for field in required_fields:
+                filters[f"{field}_null"] = {field: None}
+                filters[f"{field}_empty"] = {field: ""}
+            counts = self.count_matching(collection, filters)
             
             for field in required_fields:
                 # Check for null values
-                null_count = collection.count_documents({field: None})
+                null_count = counts[f"{field}_null"]
                 if null_count > 0:
                     self.log_error("missing_required_fields", f"Required field '{field}' is null", {
                         "collection": collection_name,
@@ -147,7 +157,7 @@ class DataValidator:
                     })
                 
                 # Check for empty strings
-                empty_count = collection.count_documents({field: ""})
+                empty_count = counts[f"{field}_empty"]
                 if empty_count > 0:
                     self.log_error("missing_required_fields", f"Required field '{field}' is empty", {
                         "collection": collection_name,
@@ -162,12 +172,12 @@ class DataValidator:
         collections_to_check = [SONGS_MASTER_COLLECTION, ARTISTS_MASTER_COLLECTION]
         
         for collection_name in collections_to_check:
-            collection = self.db[collection_name]
+            collection = self.collections[collection_name]
             
             # Check for non-boolean is_soundtrack values
             invalid_count = collection.count_documents({
                 "is_soundtrack": {"$exists": True, "$not": {"$type": "bool"}}
-            })
+            }, maxTimeMS=QUERY_TIMEOUT_MS)
             
             if invalid_count > 0:
                 self.log_error("invalid_data_types", "is_soundtrack field is not boolean", {
@@ -183,10 +193,10 @@ class DataValidator:
         collections_to_check = [SONGS_MASTER_COLLECTION, ARTISTS_MASTER_COLLECTION]
         
         for collection_name in collections_to_check:
-            collection = self.db[collection_name]
+            collection = self.collections[collection_name]
             
             # Check for null language values
-            null_language_count = collection.count_documents({"language": None})
+            null_language_count = collection.count_documents({"language": None}, maxTimeMS=QUERY_TIMEOUT_MS)
             if null_language_count > 0:
                 self.log_error("missing_language", "Language field is null", {
                     "collection": collection_name,
@@ -200,67 +210,64 @@ class DataValidator:
         collections_to_check = [SONGS_MASTER_COLLECTION, ARTISTS_MASTER_COLLECTION]
         
         for collection_name in collections_to_check:
-            collection = self.db[collection_name]
+            collection = self.collections[collection_name]
             
-            # Check for invalid detection methods
-            invalid_methods = list(collection.find({
-                "detection_method": {
-                    "$exists": True,
-                    "$nin": list(VALID_DETECTION_METHODS) + [None]
-                }
-            }, {"detection_method": 1}).limit(10))
+            # Check for invalid detection methods: only the distinct values come back, then set difference
+            unique_invalid = set(collection.distinct("detection_method", maxTimeMS=QUERY_TIMEOUT_MS)) - VALID_DETECTION_METHODS - {None}
             
-            if invalid_methods:
-                unique_invalid = set(doc.get("detection_method") for doc in invalid_methods)
+            if unique_invalid:
+                invalid_count = collection.count_documents({"detection_method": {"$in": list(unique_invalid)}}, maxTimeMS=QUERY_TIMEOUT_MS)
                 self.log_error("invalid_detection_method", "Invalid detection methods found", {
                     "collection": collection_name,
                     "invalid_methods": list(unique_invalid),
                     "valid_methods": list(VALID_DETECTION_METHODS),
-                    "count": len(invalid_methods)
+                    "count": invalid_count
                 })
     
     def validate_character_detection_consistency(self):
         """Validate Hebrew/Japanese character detection consistency"""
         logger.info("🔤 Validating character detection consistency...")
         
-        songs_collection = self.db[SONGS_MASTER_COLLECTION]
+        songs_collection = self.collections[SONGS_MASTER_COLLECTION]
         
-        # Process in batches
-        total_songs = songs_collection.count_documents({})
+        # The server filters with the same character classes, so only mismatched songs cross the wire
+        checks = [
+            (HEBREW_CHAR_CLASS, "Hebrew"),
+            (JAPANESE_CHAR_CLASS, "Japanese")
+        ]
         inconsistencies = 0
-        
-        for skip in range(0, min(total_songs, 5000), BATCH_SIZE):  # Limit to 5000 for performance
-            songs_batch = list(songs_collection.find({}).skip(skip).limit(BATCH_SIZE))
+        logged = 0
+        
+        for char_class, expected_language in checks:
+            pipeline = [
+                {"$match": {
+                    "language": {"$ne": expected_language},
+                    "$or": [
+                        {"song_name": {"$regex": char_class}},
+                        {"artist_name": {"$regex": char_class}}
+                    ]
+                }},
+                {"$facet": {
+                    "count": [{"$count": "n"}],
+                    "sample": [
+                        {"$limit": 10},
+                        {"$project": {"song_name": 1, "artist_name": 1, "language": 1, "_id": 0}}
+                    ]
+                }}
+            ]
+            result = next(songs_collection.aggregate(pipeline, **AGGREGATE_OPTIONS), {})
             
-            for song in songs_batch:
-                song_name = song.get('song_name', '')
-                artist_name = song.get('artist_name', '')
-                language = song.get('language', '')
-                combined_text = f"{song_name} {artist_name}"
-                
-                # Check Hebrew consistency
-                has_hebrew_chars = self.detect_hebrew_chars(combined_text)
-                if has_hebrew_chars and language != "Hebrew":
-                    inconsistencies += 1
-                    if inconsistencies <= 10:  # Log only first 10 to avoid spam
-                        self.log_error("character_detection_inconsistency", "Hebrew characters found but language is not Hebrew", {
-                            "song_name": song_name,
-                            "artist_name": artist_name,
-                            "current_language": language,
-                            "expected_language": "Hebrew"
-                        })
-                
-                # Check Japanese consistency
-                has_japanese_chars = self.detect_japanese_chars(combined_text)
-                if has_japanese_chars and language != "Japanese":
-                    inconsistencies += 1
-                    if inconsistencies <= 10:  # Log only first 10 to avoid spam
-                        self.log_error("character_detection_inconsistency", "Japanese characters found but language is not Japanese", {
-                            "song_name": song_name,
-                            "artist_name": artist_name,
-                            "current_language": language,
-                            "expected_language": "Japanese"
-                        })
+            for song in result.get("sample", []):
+                if logged < 10:  # Log only first 10 to avoid spam
+                    logged += 1
+                    self.log_error("character_detection_inconsistency", f"{expected_language} characters found but language is not {expected_language}", {
+                        "song_name": song.get('song_name', ''),
+                        "artist_name": song.get('artist_name', ''),
+                        "current_language": song.get('language', ''),
+                        "expected_language": expected_language
+                    })
+            
+            inconsistencies += result["count"][0]["n"] if result.get("count") else 0
         
         if inconsistencies > 10:
             logger.warning(f"Found {inconsistencies} character detection inconsistencies (showing first 10)")
@@ -273,50 +280,64 @@ class DataValidator:
         """Validate relationships between collections (sample check)"""
         logger.info("🔗 Validating cross-collection relationships...")
         
-        streaming_collection = self.db[STREAMING_COLLECTION]
-        songs_collection = self.db[SONGS_MASTER_COLLECTION]
-        artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
-        
-        # Sample recent records for validation
-        recent_records = list(streaming_collection.find().sort("ts_utc", -1).limit(100))
+        streaming_collection = self.collections[STREAMING_COLLECTION]
         
-        missing_songs = 0
-        missing_artists = 0
+        # Sample recent records and join them against the master collections in one aggregation
+        # (records without a track or artist name count toward the sample but are not checked)
+        pipeline = [
+            {"$sort": {"ts_utc": -1}},
+            {"$limit": 100},
+            {"$project": {
+                "_id": 0,
+                "track_name": 1,
+                "artist_name": 1,
+                "complete": {"$and": [
+                    {"$ne": [{"$ifNull": ["$track_name", ""]}, ""]},
+                    {"$ne": [{"$ifNull": ["$artist_name", ""]}, ""]}
+                ]}
+            }},
+            {"$lookup": {
+                "from": SONGS_MASTER_COLLECTION,
+                "localField": "track_name",
+                "foreignField": "song_name",
+                "let": {"artist_name": "$artist_name"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$artist_name", "$$artist_name"]}}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}}
+                ],
+                "as": "songs"
+            }},
+            {"$lookup": {
+                "from": ARTISTS_MASTER_COLLECTION,
+                "localField": "artist_name",
+                "foreignField": "artist_name",
+                "pipeline": [{"$limit": 1}, {"$project": {"_id": 1}}],
+                "as": "artists"
+            }},
+            {"$group": {
+                "_id": None,
+                "sample_size": {"$sum": 1},
+                "missing_songs": {"$sum": {"$cond": [{"$and": ["$complete", {"$eq": [{"$size": "$songs"}, 0]}]}, 1, 0]}},
+                "missing_artists": {"$sum": {"$cond": [{"$and": ["$complete", {"$eq": [{"$size": "$artists"}, 0]}]}, 1, 0]}}
+            }}
+        ]
+        result = next(streaming_collection.aggregate(pipeline, **AGGREGATE_OPTIONS), {})
         
-        for record in recent_records:
-            track_name = record.get("track_name", "")
-            artist_name = record.get("artist_name", "")
-            
-            if not track_name or not artist_name:
-                continue
-            
-            # Check if song exists in songs_master
-            song_exists = songs_collection.count_documents({
-                "song_name": track_name,
-                "artist_name": artist_name
-            }) > 0
-            
-            if not song_exists:
-                missing_songs += 1
-            
-            # Check if artist exists in artists_master
-            artist_exists = artists_collection.count_documents({
-                "artist_name": artist_name
-            }) > 0
-            
-            if not artist_exists:
-                missing_artists += 1
+        sample_size = result.get("sample_size", 0)
+        missing_songs = result.get("missing_songs", 0)
+        missing_artists = result.get("missing_artists", 0)
         
         if missing_songs > 0:
             self.log_error("missing_master_records", "Songs in StreamingHistory not found in songs_master", {
                 "missing_songs_count": missing_songs,
-                "sample_size": len(recent_records)
+                "sample_size": sample_size
             })
         
         if missing_artists > 0:
             self.log_error("missing_master_records", "Artists in StreamingHistory not found in artists_master", {
                 "missing_artists_count": missing_artists,
-                "sample_size": len(recent_records)
+                "sample_size": sample_size
             })
         
         if missing_songs == 0 and missing_artists == 0:
@@ -326,70 +347,73 @@ class DataValidator:
         """Check for duplicate records (sample check)"""
         logger.info("👥 Validating for duplicates...")
         
-        # Check for duplicate songs
-        songs_collection = self.db[SONGS_MASTER_COLLECTION]
-        
-        pipeline = [
+        # Group only the name variants into sets ($addToSet) rather than pushing a sub-document per song
+        songs_pipeline = [
             {"$group": {
                 "_id": {
                     "song_name_lower": {"$toLower": "$song_name"},
                     "artist_name_lower": {"$toLower": "$artist_name"}
                 },
                 "count": {"$sum": 1},
-                "docs": {"$push": {"song_name": "$song_name", "artist_name": "$artist_name"}}
+                "song_names": {"$addToSet": "$song_name"},
+                "artist_names": {"$addToSet": "$artist_name"}
             }},
             {"$match": {"count": {"$gt": 1}}},
             {"$limit": 10}  # Limit to first 10 duplicates
         ]
         
-        duplicate_songs = list(songs_collection.aggregate(pipeline))
-        
-        if duplicate_songs:
-            for dup in duplicate_songs:
-                self.log_error("duplicates", "Duplicate songs found", {
-                    "song_variations": [doc["song_name"] for doc in dup["docs"]],
-                    "artist_variations": [doc["artist_name"] for doc in dup["docs"]],
-                    "duplicate_count": dup["count"]
-                })
-        
-        # Check for duplicate artists
-        artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
-        
-        pipeline = [
+        artists_pipeline = [
             {"$group": {
                 "_id": {"artist_name_lower": {"$toLower": "$artist_name"}},
                 "count": {"$sum": 1},
-                "docs": {"$push": {"artist_name": "$artist_name"}}
+                "artist_names": {"$addToSet": "$artist_name"}
             }},
             {"$match": {"count": {"$gt": 1}}},
             {"$limit": 10}  # Limit to first 10 duplicates
         ]
         
-        duplicate_artists = list(artists_collection.aggregate(pipeline))
+        # This check already runs alongside the others in main(), so the two scans run one after the other
+        duplicate_songs = list(self.collections[SONGS_MASTER_COLLECTION].aggregate(songs_pipeline, **AGGREGATE_OPTIONS))
+        duplicate_artists = list(self.collections[ARTISTS_MASTER_COLLECTION].aggregate(artists_pipeline, **AGGREGATE_OPTIONS))
         
-        if duplicate_artists:
-            for dup in duplicate_artists:
-                self.log_error("duplicates", "Duplicate artists found", {
-                    "artist_variations": [doc["artist_name"] for doc in dup["docs"]],
-                    "duplicate_count": dup["count"]
-                })
+        # Check for duplicate songs
+        for dup in duplicate_songs:
+            self.log_error("duplicates", "Duplicate songs found", {
+                "song_variations": dup["song_names"],
+                "artist_variations": dup["artist_names"],
+                "duplicate_count": dup["count"]
+            })
+        
+        # Check for duplicate artists
+        for dup in duplicate_artists:
+            self.log_error("duplicates", "Duplicate artists found", {
+                "artist_variations": dup["artist_names"],
+                "duplicate_count": dup["count"]
+            })
     
     def validate_spotify_data(self):
         """Validate Spotify URI and metadata (sample check)"""
         logger.info("🎵 Validating Spotify data...")
         
-        songs_collection = self.db[SONGS_MASTER_COLLECTION]
-        artists_collection = self.db[ARTISTS_MASTER_COLLECTION]
+        songs_collection = self.collections[SONGS_MASTER_COLLECTION]
+        artists_collection = self.collections[ARTISTS_MASTER_COLLECTION]
         
-        # Check for missing Spotify URIs in songs (sample)
-        missing_song_uris = songs_collection.count_documents({
-            "$or": [
+        # Count missing URIs and missing metadata in songs in one aggregation
+        song_counts = self.count_matching(songs_collection, {
+            "missing_uri": {"$or": [
                 {"spotify_track_uri": None},
                 {"spotify_track_uri": ""},
                 {"spotify_track_uri": {"$exists": False}}
-            ]
+            ]},
+            "missing_metadata": {"$or": [
+                {"duration_ms": None},
+                {"popularity": None}
+            ]}
         })
         
+        # Check for missing Spotify URIs in songs (sample)
+        missing_song_uris = song_counts["missing_uri"]
+        
         if missing_song_uris > 0:
             self.log_error("missing_spotify_data", "Missing spotify_track_uri in songs", {
                 "collection": "songs_master",
@@ -403,7 +427,7 @@ class DataValidator:
                 {"artist_uri": ""},
                 {"artist_uri": {"$exists": False}}
             ]
-        })
+        }, maxTimeMS=QUERY_TIMEOUT_MS)
         
         if missing_artist_uris > 0:
             self.log_error("missing_spotify_data", "Missing artist_uri in artists", {
@@ -412,12 +436,7 @@ class DataValidator:
             })
         
         # Check for missing metadata
-        missing_metadata_songs = songs_collection.count_documents({
-            "$or": [
-                {"duration_ms": None},
-                {"popularity": None}
-            ]
-        })
+        missing_metadata_songs = song_counts["missing_metadata"]
         
         if missing_metadata_songs > 0:
             self.log_error("missing_spotify_data", "Missing metadata in songs", {
@@ -434,7 +453,8 @@ def connect_to_mongodb():
     
     try:
         logger.info("Connecting to MongoDB Atlas...")
-        client = MongoClient(MONGODB_CONNECTION_STRING)
+        # Reads stay on the primary: the pipeline validates writes made moments earlier in the same run
+        client = MongoClient(MONGODB_CONNECTION_STRING, appname="validator")
         client.admin.command('ping')
         logger.info("✅ Connected to MongoDB Atlas")
         return client
@@ -451,61 +471,48 @@ def main():
     if not client:
         return
     
+    validator = None
     try:
         db = client[DATABASE_NAME]
         validator = DataValidator(db)
+        validator.ensure_indexes()
         
         # Run all validation checks
         logger.info("🔍 Starting comprehensive data validation...\n")
         
-        # 1. Fix soundtrack consistency (auto-fix)
+        # 1. Fix soundtrack consistency (auto-fix) - runs first since the checks below read what it writes
         validator.validate_soundtrack_consistency()
         
-        # 2. Validate required fields
-        validator.validate_required_fields()
-        
-        # 3. Validate boolean fields
-        validator.validate_boolean_fields()
-        
-        # 4. Validate language fields
-        validator.validate_language_fields()
-        
-        # 5. Validate detection methods
-        validator.validate_detection_methods()
-        
-        # 6. Validate character detection consistency
-        validator.validate_character_detection_consistency()
-        
-        # 7. Validate cross-collection relationships
-        validator.validate_cross_collection_relationships()
-        
-        # 8. Check for duplicates
-        validator.validate_duplicates()
-        
-        # 9. Validate Spotify data
-        validator.validate_spotify_data()
+        # 2-9. The remaining checks are read-only and independent, so their round-trips overlap
+        checks = [
+            validator.validate_required_fields,
+            validator.validate_boolean_fields,
+            validator.validate_language_fields,
+            validator.validate_detection_methods,
+            validator.validate_character_detection_consistency,
+            validator.validate_cross_collection_relationships,
+            validator.validate_duplicates,
+            validator.validate_spotify_data
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHECKS) as executor:
+            futures = [executor.submit(check) for check in checks]
+            for future in futures:
+                future.result()  # Re-raise any check failure
         
         # Summary
         logger.info("=" * 60)
         logger.info("DATA VALIDATION SUMMARY")
         logger.info("=" * 60)
-        logger.info(f"Total errors found: {len(validator.errors)}")
+        total_errors = sum(validator.error_counts.values())
+        logger.info(f"Total errors found: {total_errors}")
         logger.info(f"Automatic fixes applied: {validator.fixes_applied}")
         
-        if len(validator.errors) == 0:
+        if total_errors == 0:
             logger.info("🎉 All data is consistent - no issues found!")
         else:
-            logger.warning(f"📋 Found {len(validator.errors)} validation issues")
-            
-            # Group errors by category for summary
-            error_categories = {}
-            for error in validator.errors:
-                cat = error["category"]
-                if cat not in error_categories:
-                    error_categories[cat] = 0
-                error_categories[cat] += 1
+            logger.warning(f"📋 Found {total_errors} validation issues")
             
-            for category, count in error_categories.items():
+            for category, count in validator.error_counts.items():
                 logger.info(f"  {category}: {count} issues")
         
     except Exception as e:
@@ -513,6 +520,8 @@ def main():
         raise
         
     finally:
+        if validator:
+            validator.close()
         client.close()
         logger.info("MongoDB connection closed")
 